@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-from datetime import date
+from collections.abc import Mapping
+from datetime import date, timedelta
+from functools import lru_cache
 import re
+from types import MappingProxyType
+
+import ahocorasick
+import numpy as np
 import pandas as pd
 
 # ---------------------------------------------------------------------------
 # Keyword → category mapping.
 # Keys are lowercased substrings; first match wins.
+# Read-only: the matchers below are compiled from it once at import.
 # ---------------------------------------------------------------------------
-CATEGORY_RULES: dict[str, str] = {
+CATEGORY_RULES: Mapping[str, str] = MappingProxyType({
     # Income
     "payroll":      "Income",
     "salary":       "Income",
@@ -105,7 +112,34 @@ CATEGORY_RULES: dict[str, str] = {
     "groceries": "Groceries",
     "nails": "Health",
     "savings": "Transfer",    
-}
+})
+
+# Every label categorize() can return, as a fixed dtype so category columns
+# from different windows share codes (concat/merge/compare stay categorical).
+CATEGORY_DTYPE = pd.CategoricalDtype(
+    categories=sorted({*CATEGORY_RULES.values(), "Transfer", "Other"})
+)
+
+# ---------------------------------------------------------------------------
+# Keyword automaton (Aho-Corasick)
+# One linear pass over the text finds every keyword; each hit carries its
+# position in CATEGORY_RULES so the lowest one reproduces first-match-wins.
+# ---------------------------------------------------------------------------
+def _build_keyword_automaton() -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for priority, (keyword, category) in enumerate(CATEGORY_RULES.items()):
+        automaton.add_word(keyword, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def _match_category(text: str) -> str | None:
+    """Return the category of the highest-priority keyword found in text, if any."""
+    hit = min(_KEYWORD_AUTOMATON.iter(text), key=lambda h: h[1][0], default=None)
+    return hit[1][1] if hit is not None else None
+
 
 # ---------------------------------------------------------------------------
 # Transfer detection (HIGH PRECISION)
@@ -132,9 +166,18 @@ _TRANSFER_NOISE = {
 _RE_MASKED = re.compile(r"\bxx\d+\b", re.IGNORECASE)   # e.g. xx6405
 _RE_LONGNUM = re.compile(r"\b\d{4,}\b")                # long ids, refs
 _RE_NONALPHA = re.compile(r"[^a-z\s]")                 # keep letters/spaces
-_RE_SPACES = re.compile(r"\s+")
 
-def transfer_reason(description: str, tail_words: int = 3) -> str:
+
+def _fuse(*patterns: re.Pattern) -> re.Pattern:
+    """
+    Combine cleanup patterns into one alternation so a single sub() pass
+    replaces them all. Callers lowercase first, so per-pattern flags are dropped.
+    """
+    return re.compile("|".join(p.pattern for p in patterns))
+
+_RE_REASON_NOISE = _fuse(_RE_MASKED, _RE_LONGNUM, _RE_NONALPHA)
+
+def transfer_reason(description: str, tail_words: int = 3, already_lower: bool = False) -> str:
     """
     Extract a short "reason" phrase from a transfer description.
 
@@ -147,22 +190,18 @@ def transfer_reason(description: str, tail_words: int = 3) -> str:
       - remove punctuation
       - drop noise tokens (transfer/to/from/commbank/app/...)
       - return last N remaining words (tail-focused)
-    """
-    if not isinstance(description, str):
-        return ""
 
-    s = description.lower().strip()
-    s = _RE_MASKED.sub(" ", s)
-    s = _RE_LONGNUM.sub(" ", s)
-    s = _RE_NONALPHA.sub(" ", s)
-    s = _RE_SPACES.sub(" ", s).strip()
+    Pass already_lower=True when the caller has lowercased the text.
+    """
+    s = _RE_REASON_NOISE.sub(" ", description if already_lower else description.lower())
 
-    words = [w for w in s.split() if w and w not in _TRANSFER_NOISE]
+    words = [w for w in s.split() if w not in _TRANSFER_NOISE]
     if not words:
         return ""
 
     return " ".join(words[-tail_words:])
 
+
 # ---------------------------------------------------------------------------
 # Categorization helpers
 # ---------------------------------------------------------------------------
@@ -176,7 +215,9 @@ _NOISE_TOKEN = re.compile(
     re.IGNORECASE,
 )
 
-def categorization_key(description: str, tail_words: int = 5) -> str:
+_RE_KEY_NOISE = _fuse(_RE_MASKED, _NOISE_TOKEN, _RE_NONALPHA)
+
+def categorization_key(description: str, tail_words: int = 5, already_lower: bool = False) -> str:
     """
     Produce a cleaned key for rule matching (non-transfer).
 
@@ -185,27 +226,24 @@ def categorization_key(description: str, tail_words: int = 5) -> str:
     - remove digits + common noise tokens (nsw/aus/pty/etc.)
     - collapse whitespace
     - keep last N words (tail-focused but not destructive)
-    """
-    if not isinstance(description, str):
-        return ""
 
-    s = description.lower().strip()
+    Pass already_lower=True when the caller has lowercased the text.
+    """
+    s = (description if already_lower else description.lower()).strip()
     s = _PAYMENT_PREFIX.sub("", s)
-    s = _RE_MASKED.sub(" ", s)
-    s = _NOISE_TOKEN.sub(" ", s)
-    s = _RE_NONALPHA.sub(" ", s)
-    s = _RE_SPACES.sub(" ", s).strip()
+    s = _RE_KEY_NOISE.sub(" ", s)
 
-    if not s:
-        return ""
-    parts = s.split()
-    return " ".join(parts[-tail_words:]) if len(parts) > tail_words else s
+    return " ".join(s.split()[-tail_words:])
 
 
+@lru_cache(maxsize=4096)
 def categorize(description: str) -> str:
     """
     Return the first matching category for a raw transaction description.
 
+    Results are memoized: the same merchant strings recur constantly, and the
+    function is pure in its argument.
+
     Strategy:
     - If it's a transfer: match against transfer_reason() first (tail), then fallback to full.
     - Otherwise: match against categorization_key() first (cleaned/tail), then fallback to full.
@@ -214,119 +252,156 @@ def categorize(description: str) -> str:
     if not isinstance(description, str) or not description:
         return "Other"
 
+    # Lowercase once and hand the result to every helper
     lowered = description.lower()
 
     # Transfers: focus on extracted reason at the end
-    if is_transfer(description):
-        reason = transfer_reason(description)
-
-        if reason:
-            # Try matching reason first
-            for keyword, category in CATEGORY_RULES.items():
-                if keyword in reason:
-                    return category
+    if is_transfer(lowered):
+        reason = transfer_reason(lowered, already_lower=True)
 
         # If reason didn't match anything meaningful,
         # classify as pure Transfer
-        return "Transfer"
+        return _match_category(reason) or "Transfer"
+
+    # Non-transfers: use cleaned key first, then fallback to raw lowered
+    key = categorization_key(lowered, already_lower=True)
+    return _match_category(key) or _match_category(lowered) or "Other"
 
-    # Non-transfers: use cleaned key first
-    key = categorization_key(description)
-    if key:
-        for keyword, category in CATEGORY_RULES.items():
-            if keyword in key:
-                return category
 
-    # fallback to raw lowered
-    for keyword, category in CATEGORY_RULES.items():
-        if keyword in lowered:
-            return category
+def _categorize_column(descriptions: pd.Series) -> pd.Categorical:
+    """Column-wise equivalent of applying categorize() to every description.
 
-    return "Other"
+    Expects a str-dtype column with no missing values (see add_categories()).
+    Merchant strings repeat heavily, so categorize() runs once per distinct
+    description and the result is broadcast back through the factorize codes.
+    """
+    codes, uniques = pd.factorize(descriptions)
+    categories = np.array([categorize(d) for d in uniques], dtype=object)
+    # Few distinct labels: store as int codes so downstream groupbys hash once
+    return pd.Categorical(categories[codes], dtype=CATEGORY_DTYPE)
 
 
 def add_categories(df: pd.DataFrame) -> pd.DataFrame:
-    """Return df with a new 'category' column derived from the 'description' column."""
-    df = df.copy()
+    """Return df with a new 'category' column derived from the 'description' column.
+
+    'description' is normalized to str dtype with missing values as "", so
+    categorize() never sees non-string values. Only the new and
+    normalized columns are allocated; the rest are shared with df.
+    """
     if "description" not in df.columns:
-        df["category"] = "Other"
-        return df
-    df["category"] = df["description"].apply(categorize)
-    return df
+        return df.assign(category=pd.Categorical(["Other"] * len(df), dtype=CATEGORY_DTYPE))
+    descriptions = df["description"].fillna("").astype("str")
+    return df.assign(description=descriptions, category=_categorize_column(descriptions))
 
 
 # ---------------------------------------------------------------------------
 # Spending breakdown
 # ---------------------------------------------------------------------------
-def spending_by_category(df: pd.DataFrame) -> pd.DataFrame:
-    """Filter expense rows (amount < 0), group by category, and return
-    DataFrame[category, total] sorted by total spend descending (absolute value)."""
-    _EMPTY = pd.DataFrame(columns=["category", "total"])
+def _category_spend(df: pd.DataFrame | None) -> pd.Series:
+    """Positive expense totals (amount < 0, sign flipped) per category."""
     if df is None or df.empty or "amount" not in df.columns or "category" not in df.columns:
-        return _EMPTY
-    expenses = df[df["amount"] < 0]
-    if expenses.empty:
-        return _EMPTY
+        return pd.Series(dtype="float64")
+    # Zero out income instead of filtering rows, so no expense-only copy is made
+    amount = df["amount"]
+    totals = amount.where(amount < 0, 0.0).groupby(df["category"], observed=True).sum().mul(-1)
+    return totals[totals > 0]
+
+
+def _spending_table(totals: pd.Series) -> pd.DataFrame:
+    if totals.empty:
+        return pd.DataFrame(columns=["category", "total"])
     return (
-        expenses.groupby("category")["amount"]
-        .sum()
-        .abs()
+        totals.rename("total")
+        .rename_axis("category")
         .reset_index()
-        .rename(columns={"amount": "total"})
         .sort_values("total", ascending=False)
         .reset_index(drop=True)
     )
 
 
+def spending_by_category(df: pd.DataFrame) -> pd.DataFrame:
+    """Sum expense amounts (amount < 0) per category and return
+    DataFrame[category, total] sorted by total spend descending (absolute value)."""
+    return _spending_table(_category_spend(df))
+
+
 # ---------------------------------------------------------------------------
 # Period-over-period comparison
 # ---------------------------------------------------------------------------
+@lru_cache(maxsize=64)
 def previous_window(start: date, end: date) -> tuple[date, date]:
     """Return the immediately preceding equal-length window."""
-    from datetime import timedelta
     window_length = (end - start).days + 1
     prev_end = start - timedelta(days=1)
     prev_start = prev_end - timedelta(days=window_length - 1)
     return prev_start, prev_end
 
 
+def _deltas_table(current: pd.Series, previous: pd.Series) -> pd.DataFrame:
+    if current.empty and previous.empty:
+        # Typed numeric columns so callers can nlargest()/compare without a guard
+        return pd.DataFrame(columns=["category", "current", "previous", "delta"]).astype(
+            {"current": "float64", "previous": "float64", "delta": "float64"}
+        )
+    table = (
+        pd.concat({"current": current, "previous": previous}, axis=1)
+        .fillna(0.0)
+        .rename_axis("category")
+    )
+    table["delta"] = table["current"] - table["previous"]
+    return table.reset_index().sort_values("delta", ascending=False).reset_index(drop=True)
+
+
 def category_deltas(current_df: pd.DataFrame, previous_df: pd.DataFrame) -> pd.DataFrame:
     """Compare category spending between two equal-length windows."""
-    _EMPTY = pd.DataFrame(columns=["category", "current", "previous", "delta"])
-    current = spending_by_category(current_df).rename(columns={"total": "current"})
-    previous = spending_by_category(previous_df).rename(columns={"total": "previous"})
-    if current.empty and previous.empty:
-        return _EMPTY
-    merged = current.merge(previous, on="category", how="outer").fillna(0.0)
-    merged["delta"] = merged["current"] - merged["previous"]
-    return merged.sort_values("delta", ascending=False).reset_index(drop=True)
+    return _deltas_table(_category_spend(current_df), _category_spend(previous_df))
+
+
+def category_insights(current_df: pd.DataFrame, previous_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """spending_by_category(current_df) and category_deltas(current_df, previous_df),
+    sharing one groupby over the current window."""
+    current = _category_spend(current_df)
+    return _spending_table(current), _deltas_table(current, _category_spend(previous_df))
 
 
 # ---------------------------------------------------------------------------
 # Recurring commitments detection
 # ---------------------------------------------------------------------------
-# Strip common leading payment method prefixes before extracting merchant name
-_PAYMENT_PREFIX_RECUR = re.compile(
-    r"^(direct debit|bpay|visa purchase|eftpos|dbs\*)\s+",
-    re.IGNORECASE,
-)
+# Merchant names reuse the categorization-key cleanup (_PAYMENT_PREFIX, _RE_KEY_NOISE).
+def _normalize_merchants(descriptions: pd.Series) -> pd.Series:
+    """Column-wise merchant name: first two cleaned words, title-cased ('Unknown' if none)."""
+    s = (
+        descriptions.fillna("").str.strip()
+        .str.replace(_PAYMENT_PREFIX, "", regex=True)
+        .str.lower()
+        .str.replace(_RE_KEY_NOISE, " ", regex=True)
+    )
+    merchants = s.str.split().str[:2].str.join(" ").str.title()
+    return merchants.mask(merchants == "", "Unknown")
 
-# Remove standalone digit sequences (ref numbers, phone numbers) and common noise tokens
-_NOISE_TOKEN_RECUR = re.compile(
-    r"\b(\d[\d\-\.]*|pty|ltd|au|nz|us|ca|gb|sg|hk|nsw|vic|qld|sa|wa|tas|nt|act|card|value|date)\b",
-    re.IGNORECASE,
-)
 
-_EXTRA_SPACE = re.compile(r"\s+")
+def _classify_gaps(gaps: np.ndarray, offsets: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-merchant gap statistics over a flat layout where merchant i owns
+    gaps[offsets[i]:offsets[i + 1]] (every merchant has at least one gap).
+
+    Returns (upper median gap, gaps within 5-9 days, gaps within 25-35 days).
+    """
+    n_groups = len(offsets) - 1
+    counts = np.diff(offsets)
+    group = np.repeat(np.arange(n_groups), counts)
 
-def _normalize_merchant(description: str) -> str:
-    s = _PAYMENT_PREFIX_RECUR.sub("", (description or "").strip()).lower()
-    s = _RE_MASKED.sub(" ", s)
-    s = _NOISE_TOKEN_RECUR.sub(" ", s)
-    s = re.sub(r"[^a-z\s]", " ", s)   # or update your _RE_NONALPHA globally
-    s = _EXTRA_SPACE.sub(" ", s).strip()
-    words = s.split()
-    return " ".join(words[:2]).title() if words else "Unknown"
+    # Upper median via selection, not a full sort: keying on (group, gap) keeps
+    # groups apart, and one np.partition with every group's middle position as
+    # kth puts each group's sorted-middle gap in place.
+    span = int(gaps.max()) + 1
+    keyed = group.astype(np.int64) * span + gaps
+    mid = offsets[:-1] + counts // 2
+    median_gap = np.partition(keyed, mid)[mid] - np.arange(n_groups, dtype=np.int64) * span
+
+    weekly = np.bincount(group, weights=(gaps >= 5) & (gaps <= 9), minlength=n_groups)
+    monthly = np.bincount(group, weights=(gaps >= 25) & (gaps <= 35), minlength=n_groups)
+    return median_gap, weekly.astype(np.int64), monthly.astype(np.int64)
 
 
 def detect_recurring_commitments(df: pd.DataFrame) -> pd.DataFrame:
@@ -335,52 +410,68 @@ def detect_recurring_commitments(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty or "amount" not in df.columns or "description" not in df.columns or "date" not in df.columns:
         return pd.DataFrame(columns=cols)
 
-    expenses = df[df["amount"] < 0].copy()
+    expenses = df[df["amount"] < 0]
     if expenses.empty:
         return pd.DataFrame(columns=cols)
 
-    expenses["merchant"] = expenses["description"].apply(_normalize_merchant)
-    expenses["date"] = pd.to_datetime(expenses["date"], errors="coerce")
-    expenses = expenses.dropna(subset=["date"])
-    if expenses.empty:
+    # Dates from queries.get_transactions() are already datetime64; only parse otherwise
+    dates = expenses["date"]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format="ISO8601", errors="coerce")
+    valid = dates.notna().to_numpy()
+    if not valid.any():
+        return pd.DataFrame(columns=cols)
+
+    merchant = pd.Categorical(_normalize_merchants(expenses["description"][valid]))
+    dates = dates.to_numpy()[valid]
+    amounts = np.abs(expenses["amount"].to_numpy(dtype=np.float64)[valid])
+
+    # One (merchant code, date) sort; each merchant is then the contiguous
+    # slice starting at starts[i], found with searchsorted on the codes.
+    order = np.lexsort((dates, merchant.codes))
+    codes, dates = merchant.codes[order], dates[order]
+    starts = np.searchsorted(codes, np.arange(len(merchant.categories)))
+    counts = np.diff(np.append(starts, len(codes)))
+
+    recurring = np.flatnonzero(counts >= 3)
+    if recurring.size == 0:
         return pd.DataFrame(columns=cols)
 
-    records: list[dict] = []
-
-    for merchant, group in expenses.groupby("merchant"):
-        if len(group) < 3:
-            continue
-
-        sorted_dates = group["date"].sort_values().tolist()
-        gaps = [(sorted_dates[i + 1] - sorted_dates[i]).days for i in range(len(sorted_dates) - 1)]
-        if not gaps:
-            continue
-
-        median_gap = sorted(gaps)[len(gaps) // 2]
-
-        if 5 <= median_gap <= 9:
-            cadence = "weekly"
-            in_range = sum(1 for g in gaps if 5 <= g <= 9)
-        elif 25 <= median_gap <= 35:
-            cadence = "monthly"
-            in_range = sum(1 for g in gaps if 25 <= g <= 35)
-        else:
-            continue
-
-        records.append({
-            "merchant": merchant,
-            "cadence": cadence,
-            "median_amount": round(float(group["amount"].abs().median()), 2),
-            "last_seen": group["date"].max().date(),
-            "occurrences": int(len(group)),
-            "confidence": round(in_range / len(gaps), 2),
-        })
-
-    if not records:
+    # Gaps between consecutive dates of the same merchant, contiguous per merchant
+    day_gaps = np.diff(dates) // np.timedelta64(1, "D")
+    same_merchant = codes[1:] == codes[:-1]
+    gaps = day_gaps[same_merchant & (counts[codes[:-1]] >= 3)].astype(np.int64)
+    n_gaps = counts[recurring] - 1
+    offsets = np.concatenate(([0], np.cumsum(n_gaps)))
+
+    median_gap, n_weekly, n_monthly = _classify_gaps(gaps, offsets)
+    is_weekly = (median_gap >= 5) & (median_gap <= 9)
+    is_monthly = (median_gap >= 25) & (median_gap <= 35)
+    keep = is_weekly | is_monthly
+    if not keep.any():
         return pd.DataFrame(columns=cols)
 
+    recurring = recurring[keep]
+    is_weekly = is_weekly[keep]
+    in_range = np.where(is_weekly, n_weekly[keep], n_monthly[keep])
+    first, n = starts[recurring], counts[recurring]
+
+    # Median of absolute amounts: same slices, sorted by amount instead of date
+    by_amount = amounts[np.lexsort((amounts, merchant.codes))]
+    mid = first + n // 2
+    median_amount = np.where(n % 2 == 1, by_amount[mid], (by_amount[mid - 1] + by_amount[mid]) / 2)
+
+    result = pd.DataFrame({
+        "merchant": merchant.categories[recurring],
+        "cadence": np.where(is_weekly, "weekly", "monthly"),
+        "median_amount": median_amount.round(2),
+        "last_seen": dates[first + n - 1].astype("datetime64[D]").astype(object),
+        "occurrences": n.astype(int),
+        "confidence": (in_range / n_gaps[keep]).round(2),
+    })
+
     return (
-        pd.DataFrame(records)
+        result
         .sort_values(["cadence", "confidence"], ascending=[True, False])
         .reset_index(drop=True)
     )
\ No newline at end of file
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 from datetime import date
+import json
+import re
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import pyarrow as pa
 import streamlit as st
 
 from app import core, queries
+from app.db import DB_PATH
 
 # ---------------------------------------------------------------------------
 # Page config
@@ -20,13 +25,11 @@ st.set_page_config(
 CATEGORIZATION_VERSION = "v2-transfer-reason"
 
 # ---------------------------------------------------------------------------
-# CSS — hide chrome, style metric cards, tighten spacing
+# CSS — style metric cards, tighten spacing
+# Theme and toolbar live in .streamlit/config.toml; this is what it can't express.
+# Minified once at import, then sent as a style-only st.html (no layout slot).
 # ---------------------------------------------------------------------------
-st.markdown("""
-<style>
-#MainMenu {visibility: hidden;}
-footer    {visibility: hidden;}
-
+_CSS = """
 /* Metric cards */
 [data-testid="metric-container"] {
     background: rgba(255,255,255,0.04);
@@ -38,8 +41,8 @@ footer    {visibility: hidden;}
 [data-testid="stMetricValue"]  > div { font-size: 1.7rem;  font-weight: 700; }
 [data-testid="stMetricDelta"]  > div { font-size: 0.78rem; }
 
-/* Tighter tab strip */
-[data-testid="stTabs"] { margin-top: 4px; }
+/* Tighter view selector */
+[data-testid="stRadio"] { margin-top: 4px; }
 
 /* Section typography helpers */
 .sh { font-size: 1rem; font-weight: 600; margin: 0 0 2px; }
@@ -47,38 +50,110 @@ footer    {visibility: hidden;}
 
 /* Sidebar helper text */
 [data-testid="stSidebar"] .helper { font-size: 0.74rem; opacity: 0.5; margin-top: -6px; }
-</style>
-""", unsafe_allow_html=True)
+"""
+_CSS = " ".join(re.sub(r"/\*.*?\*/", "", _CSS, flags=re.S).split())
+
+st.html(f"<style>{_CSS}</style>")
 
 
 # ---------------------------------------------------------------------------
 # Cached data loaders  (logic unchanged)
+# Range loaders persist to disk so restarts skip SQL + categorization.
+# db_mtime is part of their keys: a new ingest invalidates persisted entries.
 # ---------------------------------------------------------------------------
-@st.cache_data
-def load_summary(start: date, end: date):
-    return queries.get_summary(start, end)
-
-@st.cache_data
-def load_monthly(start: date, end: date):
+def _db_mtime() -> float:
+    # In WAL mode commits land in the -wal file until a checkpoint
+    mtime = DB_PATH.stat().st_mtime
+    try:  # one stat, not exists() + stat()
+        wal = DB_PATH.with_name(DB_PATH.name + "-wal").stat()
+    except FileNotFoundError:
+        return mtime
+    # Our own first read creates an empty -wal; only frames mean new data
+    return max(mtime, wal.st_mtime) if wal.st_size > 0 else mtime
+
+@st.cache_data(persist="disk", max_entries=16)
+def load_monthly(start: date, end: date, db_mtime: float):
     return queries.get_monthly_totals(start, end)
 
-@st.cache_data
-def load_recent(start: date, end: date, limit: int = 50):
-    return queries.get_transactions(start, end, limit=limit)
-
-@st.cache_data
-def load_all(start: date, end: date, version: str) -> pd.DataFrame:
-    return core.add_categories(queries.get_transactions(start, end))
+@st.cache_data(persist="disk", max_entries=16)
+def _load_all_arrow(start: date, end: date, version: str, db_mtime: float) -> bytes:
+    """Categorized range as Arrow IPC stream bytes (cheap to (un)pickle on cache hits)."""
+    df = core.add_categories(queries.get_transactions(start, end))
+    # Feeds the "Rent" debug expander; computed once per cached range, not per rerun
+    df["_has_rent"] = df["description"].str.contains("rent", case=False, na=False, regex=False)
+    # Repeating merchants: codes make the debug groupby/filters int operations
+    if df["description"].nunique() < len(df) // 2:
+        df["description"] = df["description"].astype("category")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def load_all(start: date, end: date, version: str, db_mtime: float) -> pd.DataFrame:
+    return pa.ipc.open_stream(_load_all_arrow(start, end, version, db_mtime)).read_pandas()
+
+def load_insight(start: date, end: date, version: str, db_mtime: float, exclude_transfers: bool) -> pd.DataFrame:
+    """load_all() with transfers optionally removed (True Spend mode).
+
+    Deliberately uncached: a mask over the decoded frame is cheaper than
+    unpickling a second cached copy of it on every hit.
+    """
+    df = load_all(start, end, version, db_mtime)
+    if exclude_transfers and not df.empty and "category" in df.columns:
+        return df[df["category"] != "Transfer"].reset_index(drop=True)
+    return df
 
-@st.cache_data
-def get_date_bounds() -> tuple[date | None, date | None]:
+@st.cache_data(max_entries=4)
+def get_date_bounds(db_mtime: float) -> tuple[date | None, date | None]:
     return queries.get_date_bounds()
 
 
+# ---------------------------------------------------------------------------
+# Plotly theme helpers
+# ---------------------------------------------------------------------------
+# The layout below is the whole theme: figures use the empty "none" template
+# and are rendered with theme=None, so the cached JSON carries no template and
+# the frontend does no theme merge.
+_PLOTLY_BASE = dict(
+    template="none",
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor ="rgba(0,0,0,0)",
+    font=dict(color="#b0b8cc", size=12),
+    margin=dict(l=0, r=0, t=8, b=0),
+    hoverlabel=dict(bgcolor="#1a1f2e", font_color="#e0e4ef", font_size=12),
+)
+_GRID  = dict(showgrid=True,  gridcolor="rgba(255,255,255,0.06)", zeroline=False)
+_NOGRD = dict(showgrid=False, zeroline=False)
+
+
+def _currency_axis(d: dict) -> dict:
+    return {**d, "tickprefix": "$", "tickformat": ",.0f"}
+
+
+def _downsample_minmax(df: pd.DataFrame, y: str, target: int = 500) -> pd.DataFrame:
+    """Cap a series at ~target points by keeping each bucket's min and max rows.
+
+    Keeps spikes visible while bounding the payload Plotly ships to the browser.
+    """
+    if len(df) <= target:
+        return df
+    values = df[y].to_numpy()
+    keep: list[int] = []
+    for bucket in np.array_split(np.arange(len(df)), target // 2):
+        seg = values[bucket]
+        keep.extend(sorted({bucket[seg.argmin()], bucket[seg.argmax()]}))
+    return df.iloc[keep]
+
+
 # ---------------------------------------------------------------------------
 # Guard: need data before anything else
 # ---------------------------------------------------------------------------
-min_d, max_d = get_date_bounds()
+# Read once per rerun; every DB-backed cache below is keyed on it
+data_mtime = _db_mtime()
+
+min_d, max_d = get_date_bounds(data_mtime)
 if min_d is None or max_d is None:
     st.warning("No transactions found in the database yet.")
     st.stop()
@@ -120,28 +195,111 @@ with st.sidebar:
 
 
 # ---------------------------------------------------------------------------
-# Data loading
+# View model (cached) — data loading, KPIs, figures and tables
 # ---------------------------------------------------------------------------
-prev_start, prev_end = core.previous_window(start_date, end_date)
+def _summary_from_df(df: pd.DataFrame) -> tuple[float, float, float]:
+    """(income, expenses, net) from an already-loaded window — no extra SQL round-trip."""
+    amounts = df["amount"].to_numpy()
+    income = amounts[amounts > 0].sum()
+    expenses = amounts[amounts < 0].sum()
+    return float(income), float(expenses), float(income + expenses)
+
+
+def _monthly_figure(monthly_df: pd.DataFrame) -> go.Figure:
+    # No-op for typical ranges (one bar per month); bounds very long ones
+    chart_df = _downsample_minmax(monthly_df, "total")
+    bar_colors = ["#ef5350" if v < 0 else "#26a69a" for v in chart_df["total"]]
+    fig = go.Figure(go.Bar(
+        x=chart_df["month"],
+        y=chart_df["total"],
+        marker_color=bar_colors,
+        hovertemplate="<b>%{x}</b><br>Net: $%{y:,.2f}<extra></extra>",
+    ))
+    fig.add_hline(y=0, line_color="rgba(255,255,255,0.15)", line_width=1)
+    fig.update_layout(
+        **_PLOTLY_BASE,
+        height=300,
+        xaxis={**_NOGRD, "tickangle": -30},
+        yaxis=_currency_axis(_GRID),
+        bargap=0.35,
+    )
+    return fig
+
+
+def _spending_figure(spending_df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure(go.Bar(
+        x=spending_df["total"],
+        y=spending_df["category"],
+        orientation="h",
+        marker_color="#5c7cfa",
+        marker_line_width=0,
+        hovertemplate="<b>%{y}</b><br>$%{x:,.2f}<extra></extra>",
+    ))
+    fig.update_layout(
+        **_PLOTLY_BASE,
+        height=max(260, len(spending_df) * 34 + 40),
+        xaxis=_currency_axis(_GRID),
+        yaxis={**_NOGRD, "autorange": "reversed"},
+    )
+    return fig
+
+
+@st.cache_data(max_entries=16)
+def build_view(start: date, end: date, exclude_transfers: bool, version: str, db_mtime: float) -> dict:
+    """Everything the Overview/Insights tabs render, so warm reruns skip pandas + Plotly work.
+
+    Figures are stored as Plotly JSON; tables are the small display frames.
+    """
+    prev_start, prev_end = core.previous_window(start, end)
+
+    income,      expenses,      net      = _summary_from_df(load_all(start, end, version, db_mtime))
+    prev_income, prev_expenses, prev_net = _summary_from_df(load_all(prev_start, prev_end, version, db_mtime))
+    has_prev = (prev_income + abs(prev_expenses)) > 0
+    kpi_deltas = (
+        np.round(
+            np.array([income,      abs(expenses),      net])
+            - np.array([prev_income, abs(prev_expenses), prev_net]),
+            2,
+        ).tolist()
+        if has_prev else [None] * 3
+    )
 
-income,      expenses,      net      = load_summary(start_date, end_date)
-prev_income, prev_expenses, prev_net = load_summary(prev_start,  prev_end)
+    insight_df      = load_insight(start, end, version, db_mtime, exclude_transfers)
+    prev_insight_df = load_insight(prev_start, prev_end, version, db_mtime, exclude_transfers)
 
-monthly_df  = load_monthly(start_date, end_date)
-all_df      = load_all(start_date, end_date, CATEGORIZATION_VERSION)
-prev_all_df = load_all(prev_start,  prev_end,  CATEGORIZATION_VERSION)
-recent_df   = core.add_categories(load_recent(start_date, end_date, limit=50))
+    monthly_df  = load_monthly(start, end, db_mtime)
+    spending_df, deltas_df = core.category_insights(insight_df, prev_insight_df)
 
+    # Partial selection instead of masking the full table; decreases keep the
+    # descending-delta display order of the table they come from
+    increases = deltas_df.nlargest(5, "delta")[["category", "delta"]]
+    decreases = deltas_df.nsmallest(5, "delta")[["category", "delta"]]
 
-def _filter_transfers(df: pd.DataFrame) -> pd.DataFrame:
-    if exclude_transfers and not df.empty and "category" in df.columns:
-        return df[df["category"] != "Transfer"].reset_index(drop=True)
-    return df
+    commitments_df = core.detect_recurring_commitments(insight_df)
+    if not commitments_df.empty:
+        commitments_df["confidence"] = (commitments_df["confidence"] * 100).round(0).astype(int)
+
+    return {
+        "prev_window": (prev_start, prev_end),
+        "kpis": {
+            "income":         income,
+            "expenses":       abs(expenses),
+            "net":            net,
+            "income_delta":   kpi_deltas[0],
+            "expenses_delta": kpi_deltas[1],
+            "net_delta":      kpi_deltas[2],
+        },
+        "monthly_fig_json":  None if monthly_df.empty else _monthly_figure(monthly_df).to_json(),
+        "spending_fig_json": None if spending_df.empty else _spending_figure(spending_df).to_json(),
+        "increases":   increases[increases["delta"] > 0].reset_index(drop=True),
+        "decreases":   decreases[decreases["delta"] < 0].iloc[::-1].reset_index(drop=True),
+        "commitments": commitments_df,
+    }
 
-insight_df      = _filter_transfers(all_df)
-prev_insight_df = _filter_transfers(prev_all_df)
 
-has_prev = (prev_income + abs(prev_expenses)) > 0
+view = build_view(start_date, end_date, exclude_transfers, CATEGORIZATION_VERSION, data_mtime)
+prev_start, prev_end = view["prev_window"]
+kpis = view["kpis"]
 
 
 # ---------------------------------------------------------------------------
@@ -168,67 +326,114 @@ st.markdown("")
 # ---------------------------------------------------------------------------
 k1, k2, k3 = st.columns(3)
 
-income_delta   = round(income        - prev_income,          2) if has_prev else None
-expenses_delta = round(abs(expenses) - abs(prev_expenses),   2) if has_prev else None
-net_delta      = round(net           - prev_net,             2) if has_prev else None
-
-k1.metric("Total Income",    f"${income:,.2f}",        delta=income_delta,   delta_color="normal")
-k2.metric("Total Expenses",  f"${abs(expenses):,.2f}", delta=expenses_delta, delta_color="inverse")
-k3.metric("Net Change",      f"${net:,.2f}",           delta=net_delta,      delta_color="normal")
+k1.metric("Total Income",    f"${kpis['income']:,.2f}",   delta=kpis["income_delta"],   delta_color="normal")
+k2.metric("Total Expenses",  f"${kpis['expenses']:,.2f}", delta=kpis["expenses_delta"], delta_color="inverse")
+k3.metric("Net Change",      f"${kpis['net']:,.2f}",      delta=kpis["net_delta"],      delta_color="normal")
 
 st.markdown("")
 
 
 # ---------------------------------------------------------------------------
-# Plotly theme helpers
+# Debug view
 # ---------------------------------------------------------------------------
-_PLOTLY_BASE = dict(
-    paper_bgcolor="rgba(0,0,0,0)",
-    plot_bgcolor ="rgba(0,0,0,0)",
-    font=dict(color="#b0b8cc", size=12),
-    margin=dict(l=0, r=0, t=8, b=0),
-    hoverlabel=dict(bgcolor="#1a1f2e", font_color="#e0e4ef", font_size=12),
-)
-_GRID  = dict(showgrid=True,  gridcolor="rgba(255,255,255,0.06)", zeroline=False)
-_NOGRD = dict(showgrid=False, zeroline=False)
+def _debug_tab(start: date, end: date, exclude_transfers: bool, db_mtime: float) -> None:
+    """Debug tables, read from the cached loaders for the selected range."""
+    all_df     = load_all(start, end, CATEGORIZATION_VERSION, db_mtime)
+    insight_df = load_insight(start, end, CATEGORIZATION_VERSION, db_mtime, exclude_transfers)
+    # Same window as all_df, which is already newest-first: slice, don't re-query
+    recent_df  = all_df.drop(columns="_has_rent").head(50)
 
+    st.caption("Raw data tables for inspection.")
+    st.markdown("")
 
-def _currency_axis(d: dict) -> dict:
-    return {**d, "tickprefix": "$", "tickformat": ",.0f"}
+    st.markdown("**Recent transactions** (last 50)")
+    st.dataframe(
+        recent_df,
+        use_container_width=True,
+        hide_index=True,
+        height=400,
+        column_config={
+            "date":                st.column_config.DatetimeColumn("Date",        format="MMM DD, YYYY"),
+            "amount":              st.column_config.NumberColumn("Amount",         format="$%.2f"),
+            "description":         st.column_config.TextColumn("Description",     width="large"),
+            "cumulative_balance":  st.column_config.NumberColumn("Balance",        format="$%.2f"),
+            "category":            st.column_config.TextColumn("Category"),
+        },
+    )
+
+    st.markdown("")
+
+    # One groupby feeds both breakdown expanders below
+    has_insight = not insight_df.empty and "category" in insight_df.columns
+    if has_insight:
+        debug_bd = (
+            insight_df[insight_df["category"].isin(("Transfer", "Other"))]
+            .groupby(["category", "description"], observed=True, sort=False)["amount"]
+            .agg(total="sum", count="size")
+            .reset_index()
+            .assign(total=lambda d: d["total"].abs())
+        )
+
+    def _breakdown(category: str) -> pd.DataFrame:
+        return debug_bd[debug_bd["category"] == category].drop(columns="category")
+
+    with st.expander("Debug: Transfer category breakdown"):
+        if not has_insight:
+            st.caption("No insight data available.")
+        else:
+            bd = _breakdown("Transfer")
+            if bd.empty:
+                st.success("No rows currently categorized as Transfer in insight_df.")
+            else:
+                st.caption(f"{bd['count'].sum()} rows in Transfer category")
+                st.dataframe(bd.nlargest(30, "total"), use_container_width=True, hide_index=True)
+
+    with st.expander("Debug: Other / uncategorized breakdown"):
+        if not has_insight:
+            st.caption("No insight data available.")
+        else:
+            bd = _breakdown("Other")
+            if bd.empty:
+                st.success("No uncategorized rows.")
+            else:
+                st.caption(f"{bd['count'].sum()} rows categorized as Other")
+                st.dataframe(bd.nlargest(30, "total"), use_container_width=True, hide_index=True)
+
+    with st.expander("Debug: Rows containing 'Rent'"):
+        if "description" in all_df.columns and "category" in all_df.columns:
+            rent_df = all_df.loc[all_df["_has_rent"], ["date", "amount", "description", "category"]].head(50)
+            if rent_df.empty:
+                st.caption("No rows containing 'Rent' found.")
+            else:
+                st.dataframe(rent_df, use_container_width=True, hide_index=True)
+        else:
+            st.caption("Missing expected columns on all_df.")
 
 
 # ---------------------------------------------------------------------------
 # Tabs
+# A radio rather than st.tabs: only the selected view is rendered on a rerun
 # ---------------------------------------------------------------------------
-tab_overview, tab_insights, tab_debug = st.tabs(["Overview", "Insights", "Debug"])
+active_tab = st.radio(
+    "view",
+    ["Overview", "Insights", "Debug"],
+    horizontal=True,
+    label_visibility="collapsed",
+    key="active_tab",
+)
 
 
 # ── OVERVIEW ──────────────────────────────────────────────────────────────
-with tab_overview:
+if active_tab == "Overview":
 
     # Monthly net chart
     st.markdown('<p class="sh">Monthly net</p>', unsafe_allow_html=True)
     st.markdown('<p class="sc">Net cash flow by calendar month</p>', unsafe_allow_html=True)
 
-    if monthly_df.empty:
+    if view["monthly_fig_json"] is None:
         st.info("No monthly data available for the selected range.")
     else:
-        bar_colors = ["#ef5350" if v < 0 else "#26a69a" for v in monthly_df["total"]]
-        fig_monthly = go.Figure(go.Bar(
-            x=monthly_df["month"],
-            y=monthly_df["total"],
-            marker_color=bar_colors,
-            hovertemplate="<b>%{x}</b><br>Net: $%{y:,.2f}<extra></extra>",
-        ))
-        fig_monthly.add_hline(y=0, line_color="rgba(255,255,255,0.15)", line_width=1)
-        fig_monthly.update_layout(
-            **_PLOTLY_BASE,
-            height=300,
-            xaxis={**_NOGRD, "tickangle": -30},
-            yaxis=_currency_axis(_GRID),
-            bargap=0.35,
-        )
-        st.plotly_chart(fig_monthly, use_container_width=True)
+        st.plotly_chart(json.loads(view["monthly_fig_json"]), use_container_width=True, theme=None)
 
     st.markdown("")
 
@@ -237,29 +442,14 @@ with tab_overview:
     st.markdown('<p class="sh">Spending by category</p>', unsafe_allow_html=True)
     st.markdown(f'<p class="sc">Expenses only{mode_note}</p>', unsafe_allow_html=True)
 
-    spending_df = core.spending_by_category(insight_df)
-    if spending_df.empty:
+    if view["spending_fig_json"] is None:
         st.info("No expense data to display. Try adjusting the date range or spending mode.")
     else:
-        fig_spend = go.Figure(go.Bar(
-            x=spending_df["total"],
-            y=spending_df["category"],
-            orientation="h",
-            marker_color="#5c7cfa",
-            marker_line_width=0,
-            hovertemplate="<b>%{y}</b><br>$%{x:,.2f}<extra></extra>",
-        ))
-        fig_spend.update_layout(
-            **_PLOTLY_BASE,
-            height=max(260, len(spending_df) * 34 + 40),
-            xaxis=_currency_axis(_GRID),
-            yaxis={**_NOGRD, "autorange": "reversed"},
-        )
-        st.plotly_chart(fig_spend, use_container_width=True)
+        st.plotly_chart(json.loads(view["spending_fig_json"]), use_container_width=True, theme=None)
 
 
 # ── INSIGHTS ───────────────────────────────────────────────────────────────
-with tab_insights:
+elif active_tab == "Insights":
 
     # Period comparison
     st.markdown('<p class="sh">What changed vs previous period</p>', unsafe_allow_html=True)
@@ -268,11 +458,10 @@ with tab_insights:
         f"Previous: {prev_start:%b %d, %Y} – {prev_end:%b %d, %Y}"
     )
 
-    deltas_df = core.category_deltas(insight_df, prev_insight_df)
-    increases = deltas_df[deltas_df["delta"] > 0].head(5).copy()
-    decreases = deltas_df[deltas_df["delta"] < 0].tail(5).copy()
-    increases["change"] = increases["delta"].apply(lambda x: f"+${x:,.2f}")
-    decreases["change"] = decreases["delta"].apply(lambda x: f"-${abs(x):,.2f}")
+    increases = view["increases"]
+    decreases = view["decreases"]
+    # Formatting happens client-side; no per-row string building
+    change_config = {"delta": st.column_config.NumberColumn("Change", format="$%+.2f")}
 
     col1, col2 = st.columns(2)
     with col1:
@@ -281,8 +470,9 @@ with tab_insights:
             st.caption("No spending increases detected in this period.")
         else:
             st.dataframe(
-                increases[["category", "change"]].reset_index(drop=True),
+                increases,
                 use_container_width=True, hide_index=True,
+                column_config=change_config,
             )
     with col2:
         st.markdown("**Top decreases**")
@@ -290,8 +480,9 @@ with tab_insights:
             st.caption("No spending decreases detected in this period.")
         else:
             st.dataframe(
-                decreases[["category", "change"]].reset_index(drop=True),
+                decreases,
                 use_container_width=True, hide_index=True,
+                column_config=change_config,
             )
 
     st.markdown("")
@@ -304,14 +495,12 @@ with tab_insights:
         unsafe_allow_html=True,
     )
 
-    commitments_df = core.detect_recurring_commitments(insight_df)
+    commitments_df = view["commitments"]
     if commitments_df.empty:
         st.info("No recurring commitments detected. Try a wider date range (3+ months recommended).")
     else:
-        display = commitments_df.copy()
-        display["confidence"] = (commitments_df["confidence"] * 100).round(0).astype(int)
         st.dataframe(
-            display,
+            commitments_df,
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -326,73 +515,5 @@ with tab_insights:
 
 
 # ── DEBUG ──────────────────────────────────────────────────────────────────
-with tab_debug:
-    st.caption("Raw data tables for inspection.")
-    st.markdown("")
-
-    st.markdown("**Recent transactions** (last 50)")
-    st.dataframe(
-        recent_df,
-        use_container_width=True,
-        hide_index=True,
-        height=400,
-        column_config={
-            "date":                st.column_config.DatetimeColumn("Date",        format="MMM DD, YYYY"),
-            "amount":              st.column_config.NumberColumn("Amount",         format="$%.2f"),
-            "description":         st.column_config.TextColumn("Description",     width="large"),
-            "cumulative_balance":  st.column_config.NumberColumn("Balance",        format="$%.2f"),
-            "category":            st.column_config.TextColumn("Category"),
-        },
-    )
-
-    st.markdown("")
-
-    with st.expander("Debug: Transfer category breakdown"):
-        if insight_df.empty or "category" not in insight_df.columns:
-            st.caption("No insight data available.")
-        else:
-            tdf = insight_df[insight_df["category"] == "Transfer"].copy()
-            if tdf.empty:
-                st.success("No rows currently categorized as Transfer in insight_df.")
-            else:
-                bd = (
-                    tdf.groupby("description")["amount"]
-                    .agg(total="sum", count="size")
-                    .reset_index()
-                    .assign(total=lambda d: d["total"].abs())
-                    .sort_values("total", ascending=False)
-                    .head(30)
-                )
-                st.caption(f"{len(tdf)} rows in Transfer category")
-                st.dataframe(bd, use_container_width=True, hide_index=True)
-
-    with st.expander("Debug: Other / uncategorized breakdown"):
-        if insight_df.empty or "category" not in insight_df.columns:
-            st.caption("No insight data available.")
-        else:
-            odf = insight_df[insight_df["category"] == "Other"].copy()
-            if odf.empty:
-                st.success("No uncategorized rows.")
-            else:
-                bd = (
-                    odf.groupby("description")["amount"]
-                    .agg(total="sum", count="size")
-                    .reset_index()
-                    .assign(total=lambda d: d["total"].abs())
-                    .sort_values("total", ascending=False)
-                    .head(30)
-                )
-                st.caption(f"{len(odf)} rows categorized as Other")
-                st.dataframe(bd, use_container_width=True, hide_index=True)
-
-    with st.expander("Debug: Rows containing 'Rent'"):
-        if "description" in all_df.columns and "category" in all_df.columns:
-            rent_df = all_df[
-                all_df["description"].str.contains("Rent", case=False, na=False)
-            ][["date", "amount", "description", "category"]].head(50)
-            if rent_df.empty:
-                st.caption("No rows containing 'Rent' found.")
-            else:
-                st.dataframe(rent_df, use_container_width=True, hide_index=True)
-        else:
-            st.caption("Missing expected columns on all_df.")
+else:
+    _debug_tab(start_date, end_date, exclude_transfers, data_mtime)
@@ -1,14 +1,12 @@
 from __future__ import annotations
 
+from datetime import datetime
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from sqlalchemy.exc import IntegrityError
 
-from typing import Iterable, TYPE_CHECKING
-if TYPE_CHECKING:
-    from app.models import Transaction
+from typing import Any, Iterable, Mapping
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DB_PATH = BASE_DIR / "data" / "db" / "finance.db"
@@ -17,6 +15,23 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
 engine = create_engine(DATABASE_URL, future=True, echo=False)
+
+# WAL lets the dashboard read while main.py ingests, with fewer fsyncs
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",     # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",   # 256 MiB memory-mapped reads
+)
+
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+    cursor = dbapi_conn.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 SessionLocal = sessionmaker(bind=engine, 
                             autoflush=False,
                             autocommit=False,
@@ -27,21 +42,69 @@ class Base(DeclarativeBase):
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
+    # create_all() skips existing tables, indexes included; add any new ones
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    _rehash_text_ids()
+
+# PRAGMA user_version once every id is a 16-byte BLOB
+_BLOB_IDS_VERSION = 1
+
+# ids used to be SHA-256 hex TEXT; rewrite any such rows as the current
+# 16-byte ids so re-imports still dedupe against them. Runs once per DB:
+# user_version records completion so later init_db() calls skip the scan.
+def _rehash_text_ids() -> None:
+    from app.ingest import generate_transaction_id
+
+    with engine.begin() as conn:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() >= _BLOB_IDS_VERSION:
+            return
+        rows = conn.exec_driver_sql(
+            "SELECT rowid, date, amount, description_raw, cumulative_balance "
+            "FROM transactions WHERE typeof(transaction_id) = 'text'"
+        ).all()
+        if rows:
+            conn.exec_driver_sql(
+                "UPDATE transactions SET transaction_id = ? WHERE rowid = ?",
+                [
+                    (generate_transaction_id(datetime.fromisoformat(date), amount, desc, balance), rowid)
+                    for rowid, date, amount, desc, balance in rows
+                ],
+            )
+        conn.exec_driver_sql(f"PRAGMA user_version = {_BLOB_IDS_VERSION}")
+
+# inserts rows (column dicts from load_commbank_csv) into DB in one transaction
+# if a transaction already exists, skip (INSERT OR IGNORE)
+
+def save_transactions(transactions: Iterable[Mapping[str, Any]]) -> tuple[int, int]:
+    from app.models import Transaction
+
+    table = Transaction.__table__
+    columns = [c.name for c in table.columns]
+    # Column bind processors keep the stored format identical to ORM/Core
+    # writes (e.g. DateTime -> 'YYYY-MM-DD HH:MM:SS.ffffff' text)
+    processors = [c.type.dialect_impl(engine.dialect).bind_processor(engine.dialect) for c in table.columns]
+    params = [
+        tuple(p(row[c]) if p else row[c] for c, p in zip(columns, processors))
+        for row in transactions
+    ]
+    if not params:
+        return 0, 0
+
+    # OR IGNORE skips the same rows the old per-row IntegrityError path did.
+    # Plain DBAPI executemany: sqlite3 binds parameters in C, one transaction.
+    sql = (
+        f"INSERT OR IGNORE INTO {table.name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(sql, params)
+        inserted = cursor.rowcount
+        conn.commit()
+    finally:
+        conn.close()
 
-# inserts row into DB
-# if a transaction already exists, skip
-
-def save_transactions(transactions: Iterable[Transaction]) -> tuple[int, int]:
-    inserted, skipped = 0, 0
-
-    with SessionLocal() as session:
-        for tx in transactions:
-            session.add(tx)
-            try:
-                session.commit()
-                inserted += 1
-            except IntegrityError:
-                session.rollback()
-                skipped += 1
-    
-    return inserted, skipped
\ No newline at end of file
+    return inserted, len(params) - inserted
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import app.models 
-from app.db import init_db, save_transactions
+from app.db import BASE_DIR, init_db, save_transactions
 from app.ingest import load_commbank_csv
 from app.reports import print_summary, print_monthly_summary, print_all_transaction
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import os
 import shutil
 
-IMPORTS_DIR = Path("data/imports")
-ARCHIVE_DIR = Path("data/archive")
-REJECTED_DIR = Path("data/rejected")
+# Anchored like DB_PATH, so running from another directory uses the same data/
+IMPORTS_DIR = BASE_DIR / "data" / "imports"
+ARCHIVE_DIR = BASE_DIR / "data" / "archive"
+REJECTED_DIR = BASE_DIR / "data" / "rejected"
 
 def ensure_dirs():
     ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
@@ -27,21 +29,28 @@ def main():
     total_inserted = 0
     total_skipped = 0
 
-    for path in csv_files:
-        try:
-            txs = load_commbank_csv(path)
-            inserted, skipped = save_transactions(txs)
+    # Parse files in parallel (CPU-bound pandas + hashing); insert from this
+    # process in file order, so SQLite keeps a single writer and duplicate
+    # counts are deterministic
+    workers = min(len(csv_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parsed = [pool.submit(load_commbank_csv, path) for path in csv_files]
 
-            total_inserted += inserted
-            total_skipped += skipped
+        for path, future in zip(csv_files, parsed):
+            try:
+                txs = future.result()
+                inserted, skipped = save_transactions(txs)
 
-            print(f"[OK] {path.name}: inserted={inserted}, skipped={skipped}")
+                total_inserted += inserted
+                total_skipped += skipped
 
-            shutil.move(str(path), str(ARCHIVE_DIR / path.name))
+                print(f"[OK] {path.name}: inserted={inserted}, skipped={skipped}")
 
-        except Exception as e:
-            print(f"[FAIL] {path.name}: {e}")
-            shutil.move(str(path), str(REJECTED_DIR / path.name))
+                shutil.move(str(path), str(ARCHIVE_DIR / path.name))
+
+            except Exception as e:
+                print(f"[FAIL] {path.name}: {e}")
+                shutil.move(str(path), str(REJECTED_DIR / path.name))
         
         
     print(f"Total inserted={total_inserted}, Total skipped={total_skipped}")
@@ -2,14 +2,18 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import String, Float, DateTime
+from sqlalchemy import String, Float, DateTime, Index, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db import Base
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Covers date-range SUM(amount) queries (summary, monthly totals) index-only
+        Index("ix_tx_date_amount", "date", "amount"),
+    )
 
-    transaction_id: Mapped[str] = mapped_column(String, primary_key=True)
+    transaction_id: Mapped[bytes] = mapped_column(LargeBinary(16), primary_key=True)
     date: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
     amount: Mapped[float] = mapped_column(Float, nullable=False)
     description_raw: Mapped[str] = mapped_column(String, nullable=False)
@@ -1,65 +1,88 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import date, datetime, time, timedelta
+from functools import lru_cache
 
-from sqlalchemy import select, func
+from sqlalchemy import Row, case, func, literal_column, select
 
-from app.db import SessionLocal
+from app.db import SessionLocal, engine
 from app.models import Transaction
 
 
+@lru_cache(maxsize=64)
+def _day_bounds(start: date, end: date) -> tuple[datetime, datetime]:
+    """[start, end] inclusive dates as a half-open [start_dt, end_dt_excl) datetime range."""
+    return datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+
+
 def get_date_bounds() -> tuple[date | None, date | None]:
     """Return (min_date, max_date) of all transactions in the DB."""
+    # One round-trip, but min and max stay separate scalar subqueries: SQLite
+    # only answers a lone MIN()/MAX() from the ends of the date index;
+    # "SELECT MIN(date), MAX(date)" would scan the whole index instead
     with SessionLocal() as session:
-        min_dt = session.scalar(select(func.min(Transaction.date)))
-        max_dt = session.scalar(select(func.max(Transaction.date)))
+        min_dt, max_dt = session.execute(
+            select(
+                select(func.min(Transaction.date)).scalar_subquery(),
+                select(func.max(Transaction.date)).scalar_subquery(),
+            )
+        ).one()
     if min_dt is None or max_dt is None:
         return None, None
     return min_dt.date(), max_dt.date()
 
 
+# Income and expenses in one scan (conditional aggregation)
+_SUMMARY_COLUMNS = select(
+    func.sum(case((Transaction.amount > 0, Transaction.amount))),
+    func.sum(case((Transaction.amount < 0, Transaction.amount))),
+)
+
+
 def get_summary(start: date, end: date) -> tuple[float, float, float]:
     """Return (income, expenses, net) for [start, end] inclusive."""
-    start_dt = datetime.combine(start, time.min)
-    end_dt_excl = datetime.combine(end + timedelta(days=1), time.min)
+    start_dt, end_dt_excl = _day_bounds(start, end)
 
     with SessionLocal() as session:
-        income = session.scalar(
-            select(func.sum(Transaction.amount))
-            .where(Transaction.amount > 0)
-            .where(Transaction.date >= start_dt, Transaction.date < end_dt_excl)
-        ) or 0.0
+        income, expenses = session.execute(
+            _SUMMARY_COLUMNS.where(Transaction.date >= start_dt, Transaction.date < end_dt_excl)
+        ).one()
 
-        expenses = session.scalar(
-            select(func.sum(Transaction.amount))
-            .where(Transaction.amount < 0)
-            .where(Transaction.date >= start_dt, Transaction.date < end_dt_excl)
-        ) or 0.0
+    income, expenses = income or 0.0, expenses or 0.0
+    return float(income), float(expenses), float(income + expenses)
 
-        net = income + expenses
-        return float(income), float(expenses), float(net)
 
+def _monthly_totals(stmt) -> "pd.DataFrame":
+    """Bucket a (date, amount) select into DataFrame[month: str, total: float] by YYYY-MM.
 
-def get_monthly_totals(start: date, end: date) -> "pd.DataFrame":
-    """Return DataFrame[month: str, total: float] grouped by YYYY-MM, ordered ascending."""
+    Rows come straight off the (date, amount) covering index; bucketing is an
+    integer month resample in pandas rather than a per-row strftime() + hash
+    GROUP BY in SQLite.
+    """
     import pandas as pd
 
-    start_dt = datetime.combine(start, time.min)
-    end_dt_excl = datetime.combine(end + timedelta(days=1), time.min)
+    # Columnar build straight from the cursor; no Row objects / list-of-tuples
+    df = pd.read_sql(stmt, engine)
+    if df.empty:
+        return pd.DataFrame(columns=["month", "total"])
 
-    with SessionLocal() as session:
-        stmt = (
-            select(
-                func.strftime("%Y-%m", Transaction.date).label("month"),
-                func.sum(Transaction.amount).label("total"),
-            )
-            .where(Transaction.date >= start_dt, Transaction.date < end_dt_excl)
-            .group_by("month")
-            .order_by("month")
-        )
-        rows = session.execute(stmt).all()
+    monthly = df.set_index("date").resample("MS")["amount"].agg(["sum", "count"])
+    monthly = monthly[monthly["count"] > 0]  # like GROUP BY: no rows for empty months
+    return pd.DataFrame({
+        "month": monthly.index.strftime("%Y-%m"),
+        "total": monthly["sum"].to_numpy(),
+    })
+
+
+def get_monthly_totals(start: date, end: date) -> "pd.DataFrame":
+    """Return DataFrame[month: str, total: float] grouped by YYYY-MM, ordered ascending."""
+    start_dt, end_dt_excl = _day_bounds(start, end)
 
-    return pd.DataFrame(rows, columns=["month", "total"])
+    return _monthly_totals(
+        select(Transaction.date, Transaction.amount)
+        .where(Transaction.date >= start_dt, Transaction.date < end_dt_excl)
+    )
 
 
 def get_transactions(start: date, end: date, limit: int | None = None) -> "pd.DataFrame":
@@ -67,66 +90,56 @@ def get_transactions(start: date, end: date, limit: int | None = None) -> "pd.Da
     Columns: date, amount, description, cumulative_balance."""
     import pandas as pd
 
-    start_dt = datetime.combine(start, time.min)
-    end_dt_excl = datetime.combine(end + timedelta(days=1), time.min)
+    start_dt, end_dt_excl = _day_bounds(start, end)
 
-    with SessionLocal() as session:
-        stmt = (
-            select(
-                Transaction.date,
-                Transaction.amount,
-                Transaction.description_raw,
-                Transaction.cumulative_balance,
-            )
-            .where(Transaction.date >= start_dt, Transaction.date < end_dt_excl)
-            .order_by(Transaction.date.desc())
-            .limit(limit)
+    stmt = (
+        select(
+            Transaction.date,
+            Transaction.amount,
+            Transaction.description_raw.label("description"),
+            Transaction.cumulative_balance,
         )
-        rows = session.execute(stmt).all()
-
-    return pd.DataFrame(rows, columns=["date", "amount", "description", "cumulative_balance"])
+        .where(Transaction.date >= start_dt, Transaction.date < end_dt_excl)
+        # Same-day rows stay in reverse import order (rowid), whatever index is used
+        .order_by(Transaction.date.desc(), literal_column("rowid").desc())
+        .limit(limit)
+    )
+    return pd.read_sql(stmt, engine)
 
 
 def get_all_summary() -> tuple[float, float, float]:
     """Return (income, expenses, net) across all transactions."""
     with SessionLocal() as session:
-        income = session.scalar(
-            select(func.sum(Transaction.amount)).where(Transaction.amount > 0)
-        ) or 0.0
+        income, expenses = session.execute(_SUMMARY_COLUMNS).one()
 
-        expenses = session.scalar(
-            select(func.sum(Transaction.amount)).where(Transaction.amount < 0)
-        ) or 0.0
-
-        net = income + expenses
-        return float(income), float(expenses), float(net)
+    income, expenses = income or 0.0, expenses or 0.0
+    return float(income), float(expenses), float(income + expenses)
 
 
 def get_all_monthly_totals() -> list:
     """Return list of (month, total) rows across all transactions, ordered ascending."""
-    with SessionLocal() as session:
-        stmt = (
-            select(
-                func.strftime("%Y-%m", Transaction.date).label("month"),
-                func.sum(Transaction.amount).label("total"),
-            )
-            .group_by("month")
-            .order_by("month")
+    monthly = _monthly_totals(select(Transaction.date, Transaction.amount))
+    return list(monthly.itertuples(index=False, name=None))
+
+
+def iter_all_transactions(batch_size: int = 1000) -> Iterator[Row]:
+    """Yield all transactions ordered by date ascending, fetched batch_size rows at a time.
+    Each row has: date, amount, description_raw, cumulative_balance."""
+    stmt = (
+        select(
+            Transaction.date,
+            Transaction.amount,
+            Transaction.description_raw,
+            Transaction.cumulative_balance,
         )
-        return session.execute(stmt).all()
+        .order_by(Transaction.date)
+        .execution_options(yield_per=batch_size)
+    )
+    with SessionLocal() as session:
+        yield from session.execute(stmt)
 
 
 def get_all_transactions() -> list:
     """Return all transactions ordered by date ascending.
     Each row has: date, amount, description_raw, cumulative_balance."""
-    with SessionLocal() as session:
-        stmt = (
-            select(
-                Transaction.date,
-                Transaction.amount,
-                Transaction.description_raw,
-                Transaction.cumulative_balance,
-            )
-            .order_by(Transaction.date)
-        )
-        return session.execute(stmt).all()
+    return list(iter_all_transactions())
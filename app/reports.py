@@ -1,3 +1,6 @@
+from itertools import islice
+import sys
+
 from app import queries
 
 
@@ -13,19 +16,21 @@ def print_summary():
 def print_monthly_summary():
     results = queries.get_all_monthly_totals()
 
-    print("\n==== Monthly Summary ====")
-    for month, total in results:
-        print(f"{month}: ${total:.2f}")
+    # Grouping and sums are done before this; format all lines, write once
+    lines = [f"{month}: ${total:.2f}" for month, total in results]
+    print("\n==== Monthly Summary ====", *lines, sep="\n")
 
 
 def print_all_transaction():
-    results = queries.get_all_transactions()
-
     print("\n==== All Transactions ====")
-    for tx in results:
-        print(
-            f"{tx.date.date()} | "
-            f"{tx.amount:>10.2f} | "
-            f"{tx.description_raw[:40]:<40} | "
-            f"{tx.cumulative_balance:>10.2f}"
-        )
+    lines = (
+        f"{tx.date.date()} | "
+        f"{tx.amount:>10.2f} | "
+        f"{tx.description_raw[:40]:<40} | "
+        f"{tx.cumulative_balance:>10.2f}"
+        for tx in queries.iter_all_transactions()
+    )
+    # One write per 1000 rows instead of a print() (and flush check) per row;
+    # memory stays bounded because rows are streamed
+    while chunk := list(islice(lines, 1000)):
+        sys.stdout.write("\n".join(chunk) + "\n")
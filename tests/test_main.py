@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy import create_engine
+
+import app.db as db
+import app.main as main
+
+
+class EmptyImportTest(unittest.TestCase):
+    def test_empty_csv_is_archived_with_nothing_inserted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            imports = tmp / "imports"
+            imports.mkdir()
+            (imports / "empty.csv").write_bytes(b"")
+
+            engine = create_engine(f"sqlite:///{tmp / 'finance.db'}", future=True)
+            out = io.StringIO()
+            with mock.patch.object(db, "engine", engine), \
+                 mock.patch.object(main, "IMPORTS_DIR", imports), \
+                 mock.patch.object(main, "ARCHIVE_DIR", tmp / "archive"), \
+                 mock.patch.object(main, "REJECTED_DIR", tmp / "rejected"), \
+                 contextlib.redirect_stdout(out):
+                main.main()
+            engine.dispose()
+
+            self.assertIn("[OK] empty.csv: inserted=0, skipped=0", out.getvalue())
+            self.assertTrue((tmp / "archive" / "empty.csv").exists())
+            self.assertFalse((tmp / "rejected" / "empty.csv").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()